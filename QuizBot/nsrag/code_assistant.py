@@ -2,74 +2,134 @@
 import warnings
 warnings.filterwarnings("ignore")
 
-from pathlib import Path
+import io
+import math
+import os
+import re
+from collections import defaultdict
+from heapq import nlargest
 from langchain_community.llms.ollama import Ollama
 from langchain_core.prompts import ChatPromptTemplate
 
+import codebase_cache
+
 # Initialize the model
 model = Ollama(model="llama3.2:latest")
 
 CODE_PATH = ".."
-CODE_EXTENSIONS = ['.py', '.js', '.jsx', '.html', '.css', '.json', '.md']
+CODE_EXTENSIONS = frozenset({'.py', '.js', '.jsx', '.html', '.css', '.json', '.md'})
+
+# Only this much of each file is kept in memory; the prompt slice below is
+# 2000 chars, so holding full file contents just inflates peak RSS
+MAX_READ_BYTES = 8192
+PROMPT_SLICE_CHARS = 2000
+
+# Identifier-like tokens of 4+ characters (matches the old "meaningful words" filter)
+TOKEN_RE = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]{3,}")
+
+# Standard BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
 
 def load_codebase():
-    """Load all relevant code files"""
+    """Load all relevant code files, returning (contents, mtimes) keyed by relative path"""
     code_files = {}
-    code_path = Path(CODE_PATH)
-    
-    skip_dirs = {'node_modules', '__pycache__', '.git', 'build', 'dist', 'venv', 'chroma', 'data'}
-    
-    for file_path in code_path.rglob('*'):
-        if any(skip_dir in file_path.parts for skip_dir in skip_dirs):
-            continue
-            
-        if file_path.suffix in CODE_EXTENSIONS and file_path.is_file():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    relative_path = str(file_path.relative_to(code_path))
-                    code_files[relative_path] = f.read()
-            except:
-                pass
-    
-    return code_files
+    mtimes = {}
 
+    # The shared snapshot only re-reads files whose mtime changed
+    snapshot = codebase_cache.load_snapshot(CODE_PATH)
+    for relative_path, (mtime, content) in snapshot.items():
+        if os.path.splitext(relative_path)[1] in CODE_EXTENSIONS:
+            code_files[relative_path] = content[:MAX_READ_BYTES]
+            mtimes[relative_path] = mtime
 
-def find_relevant_files(query: str, code_files: dict, max_files: int = 5):
-    """Find files most relevant to the query based on keywords"""
-    query_lower = query.lower()
-    scored_files = []
-    
+    return code_files, mtimes
+
+
+def refresh_codebase(code_files, mtimes):
+    """Reload from the snapshot, returning True if anything changed"""
+    new_files, new_mtimes = load_codebase()
+    if new_mtimes == mtimes:
+        return False
+
+    code_files.clear()
+    code_files.update(new_files)
+    mtimes.clear()
+    mtimes.update(new_mtimes)
+    return True
+
+
+def build_index(code_files):
+    """Build a BM25 index over the loaded files: token postings plus document lengths"""
+    postings = defaultdict(lambda: defaultdict(int))
+    doc_lengths = {}
+    part_paths = defaultdict(set)
     for file_path, content in code_files.items():
-        score = 0
-        content_lower = content.lower()
-        
-        # Score based on query words appearing in file
-        for word in query_lower.split():
-            if len(word) > 3:  # Only consider meaningful words
-                score += content_lower.count(word)
-        
-        # Boost score for files mentioned in query
-        if any(part in query_lower for part in file_path.lower().split('/')):
-            score += 10
-        
-        if score > 0:
-            scored_files.append((file_path, content, score))
-    
-    # Sort by score and return top files
-    scored_files.sort(key=lambda x: x[2], reverse=True)
-    return scored_files[:max_files]
+        tokens = TOKEN_RE.findall(content.lower())
+        doc_lengths[file_path] = len(tokens)
+        for token in tokens:
+            postings[token][file_path] += 1
+        for part in file_path.lower().split('/'):
+            part_paths[part].add(file_path)
+
+    avg_length = sum(doc_lengths.values()) / len(doc_lengths) if doc_lengths else 0
+    return {
+        "postings": postings,
+        "doc_lengths": doc_lengths,
+        "avg_length": avg_length,
+        "part_paths": part_paths,
+    }
+
+
+def find_relevant_files(query: str, code_files: dict, max_files: int = 5, index: dict = None):
+    """Find files most relevant to the query using BM25 over the inverted index"""
+    if index is None:
+        index = build_index(code_files)
+
+    postings = index["postings"]
+    doc_lengths = index["doc_lengths"]
+    avg_length = index["avg_length"] or 1
+    total_docs = len(doc_lengths)
 
+    query_lower = query.lower()
+    scores = defaultdict(float)
 
-def ask_about_code(question: str):
+    # BM25 (Okapi) score over query tokens, using only the matching postings
+    for token in set(TOKEN_RE.findall(query_lower)):
+        matches = postings.get(token)
+        if not matches:
+            continue
+        idf = math.log(1 + (total_docs - len(matches) + 0.5) / (len(matches) + 0.5))
+        for file_path, tf in matches.items():
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[file_path] / avg_length)
+            scores[file_path] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    # Boost score for files mentioned in query; each distinct path part is
+    # checked against the query once, not once per file
+    boosted = set()
+    for part, paths in index["part_paths"].items():
+        if part in query_lower:
+            boosted.update(paths)
+    for file_path in boosted:
+        scores[file_path] += 10
+
+    # Return the top files by score
+    top_files = nlargest(max_files, scores.items(), key=lambda item: item[1])
+    return [(file_path, code_files[file_path], score) for file_path, score in top_files if score > 0]
+
+
+def ask_about_code(question: str, code_files: dict = None, index: dict = None):
     """Ask a question about the codebase"""
     print(f"\n Question: {question}")
-    print(" Loading codebase...")
-    
-    code_files = load_codebase()
-    print(f" Loaded {len(code_files)} files")
-    
+
+    if code_files is None:
+        print(" Loading codebase...")
+        code_files, _ = load_codebase()
+        print(f" Loaded {len(code_files)} files")
+
     print(" Finding relevant files...")
-    relevant_files = find_relevant_files(question, code_files)
+    relevant_files = find_relevant_files(question, code_files, index=index)
     
     if not relevant_files:
         print(" No relevant files found")
@@ -77,13 +137,18 @@ def ask_about_code(question: str):
     
     print(f" Found {len(relevant_files)} relevant files:")
     for file_path, _, score in relevant_files:
-        print(f"  - {file_path} (relevance: {score})")
-    
-    # Build context from relevant files
-    context = "\n\n".join([
-        f"File: {file_path}\n```\n{content[:2000]}{'...' if len(content) > 2000 else ''}\n```"
-        for file_path, content, _ in relevant_files
-    ])
+        print(f"  - {file_path} (relevance: {score:.1f})")
+    
+    # Stream the context into one buffer instead of materializing an
+    # intermediate list of per-file strings
+    buf = io.StringIO()
+    for file_path, content, _ in relevant_files:
+        buf.write(f"File: {file_path}\n```\n")
+        buf.write(content[:PROMPT_SLICE_CHARS])
+        if len(content) > PROMPT_SLICE_CHARS:
+            buf.write('...')
+        buf.write("\n```\n\n")
+    context = buf.getvalue()
     
     # Create prompt
     prompt_template = ChatPromptTemplate.from_template("""
@@ -119,20 +184,28 @@ def interactive_mode():
     print("="*60)
     print("\nAsk questions about the QuizBot codebase!")
     print("Type 'exit' or 'quit' to stop\n")
-    
+
+    # Load the codebase once; each question only re-reads files that changed
+    print(" Loading codebase...")
+    code_files, mtimes = load_codebase()
+    index = build_index(code_files)
+    print(f" Loaded {len(code_files)} files")
+
     while True:
         try:
             question = input(" Your question: ").strip()
-            
+
             if question.lower() in ['exit', 'quit', 'q']:
                 print("\n Goodbye!")
                 break
-            
+
             if not question:
                 continue
-            
-            ask_about_code(question)
-            
+
+            if refresh_codebase(code_files, mtimes):
+                index = build_index(code_files)
+            ask_about_code(question, code_files, index)
+
         except KeyboardInterrupt:
             print("\n\n Goodbye!")
             break
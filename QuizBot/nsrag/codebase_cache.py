@@ -0,0 +1,115 @@
+
+"""Shared on-disk snapshot of the project's code files.
+
+code_assistant.py and populate_code_database.py used to do the same
+directory walk and file reads independently on every invocation. This
+module keeps a single pickled snapshot {relative_path: (mtime_ns, content)}
+so repeat runs only re-read files whose mtime changed.
+"""
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+# Union of the extensions both consumers care about; each caller filters
+# the snapshot down to its own subset
+CODE_EXTENSIONS = frozenset({
+    '.py', '.js', '.jsx', '.ts', '.tsx',
+    '.html', '.css', '.json', '.md',
+    '.txt', '.yml', '.yaml'
+})
+
+SKIP_DIRS = frozenset({
+    'node_modules', '__pycache__', '.git', 'build',
+    'dist', 'venv', 'env', '.venv', 'chroma', 'data'
+})
+
+# Oversized or generated files dominate read/embedding cost for little value
+MAX_FILE_BYTES = 512 * 1024
+SKIP_FILES = frozenset({'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml'})
+SKIP_SUFFIXES = ('.min.js', '.min.css', '.bundle.js')
+
+SNAPSHOT_PATH = "codebase_snapshot.pkl"
+
+
+def walk_code_files(root, skip_dirs=SKIP_DIRS):
+    """Yield paths of code files under root, pruning skipped directories early"""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name in skip_dirs:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and os.path.splitext(entry.name)[1] in CODE_EXTENSIONS:
+                    if entry.name in SKIP_FILES or entry.name.endswith(SKIP_SUFFIXES):
+                        continue
+                    try:
+                        if entry.stat(follow_symlinks=False).st_size > MAX_FILE_BYTES:
+                            continue
+                    except OSError:
+                        continue
+                    yield entry.path
+
+
+def safe_read(file_path):
+    """Read a file as UTF-8, returning None for unreadable or binary files"""
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(4096)
+            if b'\0' in head:
+                return None
+            return (head + f.read()).decode('utf-8', errors='replace')
+    except OSError:
+        return None
+
+
+def _read_snapshot(snapshot_path):
+    try:
+        with open(snapshot_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError):
+        return {}
+
+
+def _write_snapshot(snapshot, snapshot_path):
+    tmp_path = snapshot_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+
+
+def load_snapshot(root, snapshot_path=SNAPSHOT_PATH):
+    """Return {relative_path: (mtime_ns, content)}, re-reading only changed files"""
+    previous = _read_snapshot(snapshot_path)
+    snapshot = {}
+    to_read = []
+
+    for file_path in walk_code_files(root):
+        relative_path = os.path.relpath(file_path, root)
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except OSError:
+            continue
+        entry = previous.get(relative_path)
+        if entry is not None and entry[0] == mtime:
+            snapshot[relative_path] = entry
+        else:
+            to_read.append((file_path, relative_path, mtime))
+
+    if to_read:
+        # File reads are I/O bound, so fan them out across a thread pool
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            contents = executor.map(safe_read, [item[0] for item in to_read])
+            for (file_path, relative_path, mtime), content in zip(to_read, contents):
+                if content is not None:
+                    snapshot[relative_path] = (mtime, content)
+
+    if snapshot != previous:
+        _write_snapshot(snapshot, snapshot_path)
+    return snapshot
@@ -1,10 +1,13 @@
+from functools import lru_cache
 from langchain_community.embeddings.ollama import OllamaEmbeddings
 from langchain_community.embeddings.bedrock import BedrockEmbeddings
 import warnings
 warnings.filterwarnings("ignore")
 
 
+@lru_cache(maxsize=1)
 def get_embedding_function():
+    # Cached so every caller in the process shares one embeddings client
     # embeddings = BedrockEmbeddings(
     #     credentials_profile_name="default", region_name="us-east-1"
     # )
@@ -1,90 +1,174 @@
 
 import argparse
+import hashlib
+import json
 import os
-import time
-from pathlib import Path
+from itertools import groupby
+
+# orjson parses/serializes the manifest a few times faster; fall back to
+# the stdlib when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from tenacity import retry, stop_after_attempt, wait_exponential
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_text_splitters import Language, RecursiveCharacterTextSplitter
 from get_embedding_function import get_embedding_function
 from langchain_community.vectorstores.chroma import Chroma
 
+import codebase_cache
+
 CHROMA_PATH = "chroma"
-CODE_PATH = ".."  
+CODE_PATH = ".."
 
-# File extensions to process
-CODE_EXTENSIONS = [
-    '.py', '.js', '.jsx', '.ts', '.tsx', 
-    '.html', '.css', '.json', '.md',
-    '.txt', '.yml', '.yaml'
-]
+# Per-file content hashes from the previous run, used to skip unchanged files
+MANIFEST_PATH = os.path.join(CHROMA_PATH, "code_manifest.json")
+
+# File extensions to process (the shared snapshot covers exactly this set)
+CODE_EXTENSIONS = codebase_cache.CODE_EXTENSIONS
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--reset", action="store_true", help="Reset code documents in database.")
     args = parser.parse_args()
-    
+
+    # On reset, ignore the manifest so every file is re-indexed
+    manifest = {} if args.reset else load_manifest()
+
     print(" Loading code files...")
-    documents = load_code_files()
-    print(f" Loaded {len(documents)} code files")
-    
+    documents, hashes = load_code_files(manifest)
+    print(f" Loaded {len(documents)} changed code files ({len(hashes)} total)")
+
     print("  Splitting documents into chunks...")
     chunks = split_documents(documents)
     print(f" Created {len(chunks)} chunks")
-    
+
     print(" Adding to ChromaDB...")
     add_to_chroma(chunks, reset=args.reset)
+    save_manifest(hashes)
     print(" Done!")
 
 
-def load_code_files():
-    """Load all code files from the project directory"""
+def load_manifest():
+    """Load the {source: content-hash} manifest from the previous run"""
+    try:
+        with open(MANIFEST_PATH, 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if orjson else json.loads(data)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    """Atomically persist the manifest next to the chroma database"""
+    os.makedirs(CHROMA_PATH, exist_ok=True)
+    payload = orjson.dumps(manifest) if orjson else json.dumps(manifest).encode('utf-8')
+    tmp_path = MANIFEST_PATH + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def load_code_files(manifest=None):
+    """Load code files from the shared snapshot, skipping ones whose hash is unchanged
+
+    Returns (documents, hashes) where hashes maps every seen source file to its
+    current content hash, for persisting as the next run's manifest.
+    """
+    if manifest is None:
+        manifest = {}
     documents = []
-    code_path = Path(CODE_PATH)
-    
-    # Directories to skip
-    skip_dirs = {
-        'node_modules', '__pycache__', '.git', 'build', 
-        'dist', 'venv', 'env', '.venv', 'chroma', 'data'
-    }
-    
-    for file_path in code_path.rglob('*'):
-        # Skip directories and files in skip_dirs
-        if any(skip_dir in file_path.parts for skip_dir in skip_dirs):
+    hashes = {}
+
+    snapshot = codebase_cache.load_snapshot(CODE_PATH)
+    for relative_path, (_mtime, content) in snapshot.items():
+        file_name = os.path.basename(relative_path)
+
+        content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        hashes[relative_path] = content_hash
+        if manifest.get(relative_path) == content_hash:
+            # Unchanged since the last run; no need to re-split or re-embed
             continue
-            
-        # Check if file has a code extension
-        if file_path.suffix in CODE_EXTENSIONS and file_path.is_file():
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Create a document with metadata
-                doc = Document(
-                    page_content=content,
-                    metadata={
-                        "source": str(file_path.relative_to(code_path)),
-                        "file_type": file_path.suffix,
-                        "file_name": file_path.name,
-                        "type": "code"
-                    }
-                )
-                documents.append(doc)
-                print(f"  Loaded: {file_path.relative_to(code_path)}")
-            except Exception as e:
-                print(f"   Skipped {file_path.name}: {e}")
-    
-    return documents
+
+        # Create a document with metadata
+        doc = Document(
+            page_content=content,
+            metadata={
+                "source": relative_path,
+                "file_type": os.path.splitext(file_name)[1],
+                "file_name": file_name,
+                "type": "code",
+                "hash": content_hash
+            }
+        )
+        documents.append(doc)
+        print(f"  Loaded: {relative_path}")
+
+    return documents, hashes
+
+
+# Language-aware separators per extension; anything else falls back to the
+# generic character splitter
+SPLITTER_LANGUAGES = {
+    '.py': Language.PYTHON,
+    '.js': Language.JS,
+    '.jsx': Language.JS,
+    '.ts': Language.TS,
+    '.tsx': Language.TS,
+    '.html': Language.HTML,
+    '.md': Language.MARKDOWN,
+}
 
 
 def split_documents(documents: list[Document]):
     """Split documents into smaller chunks for better retrieval"""
-    text_splitter = RecursiveCharacterTextSplitter(
+    splitters = {
+        ext: RecursiveCharacterTextSplitter.from_language(
+            language=language,
+            chunk_size=1000,
+            chunk_overlap=100,
+        )
+        for ext, language in SPLITTER_LANGUAGES.items()
+    }
+    default_splitter = RecursiveCharacterTextSplitter(
         chunk_size=1000,
         chunk_overlap=100,
         length_function=len,
         is_separator_regex=False,
     )
-    return text_splitter.split_documents(documents)
+
+    # Group by file type so each group goes through the matching splitter
+    groups = {}
+    for doc in documents:
+        groups.setdefault(doc.metadata.get("file_type"), []).append(doc)
+
+    chunks = []
+    for file_type, group in groups.items():
+        splitter = splitters.get(file_type, default_splitter)
+        chunks.extend(splitter.split_documents(group))
+    return chunks
+
+
+def get_existing_code_ids(db, page_size=10_000):
+    """Page through the ids of code documents instead of loading the whole collection"""
+    existing_ids = set()
+    offset = 0
+    while True:
+        page = db.get(include=[], limit=page_size, offset=offset, where={"type": "code"})
+        ids = page["ids"]
+        if not ids:
+            break
+        existing_ids.update(ids)
+        offset += len(ids)
+    return existing_ids
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10), reraise=True)
+def add_batch(db, batch, batch_ids):
+    """Add one batch of documents, retrying with exponential backoff on failure"""
+    db.add_documents(batch, ids=batch_ids)
 
 
 def add_to_chroma(chunks: list[Document], reset: bool = False):
@@ -96,60 +180,48 @@ def add_to_chroma(chunks: list[Document], reset: bool = False):
     
     if reset:
         print("  Removing existing code documents...")
-        # Get all code document IDs
-        existing_items = db.get(include=["metadatas"])
-        code_ids = [
-            existing_items["ids"][i] 
-            for i, metadata in enumerate(existing_items["metadatas"]) 
-            if metadata.get("type") == "code"
-        ]
+        code_ids = sorted(get_existing_code_ids(db))
         if code_ids:
             db.delete(ids=code_ids)
             print(f"  Removed {len(code_ids)} code documents")
-    
+
     # Calculate chunk IDs
     chunks_with_ids = calculate_chunk_ids(chunks)
-    
+
     # Get existing IDs
-    existing_items = db.get(include=[])
-    existing_ids = set(existing_items["ids"])
-    print(f" Existing documents in DB: {len(existing_ids)}")
-    
+    existing_ids = get_existing_code_ids(db)
+    print(f" Existing code documents in DB: {len(existing_ids)}")
+
+    # Drop superseded chunks of the files being re-added: ids embed the
+    # content hash, so an edited file's previous ids (including legacy
+    # hashless ones) would otherwise linger and return stale duplicates
+    new_ids = {chunk.metadata["id"] for chunk in chunks_with_ids}
+    changed_prefixes = tuple({f"code:{chunk.metadata['source']}:" for chunk in chunks_with_ids})
+    stale_ids = sorted(
+        existing_id for existing_id in existing_ids
+        if existing_id.startswith(changed_prefixes) and existing_id not in new_ids
+    ) if changed_prefixes else []
+    if stale_ids:
+        db.delete(ids=stale_ids)
+        existing_ids.difference_update(stale_ids)
+        print(f" Removed {len(stale_ids)} superseded code chunks")
+
     # Only add new chunks
-    new_chunks = []
-    for chunk in chunks_with_ids:
-        if chunk.metadata["id"] not in existing_ids:
-            new_chunks.append(chunk)
+    new_chunks = [chunk for chunk in chunks_with_ids if chunk.metadata["id"] not in existing_ids]
     
     if len(new_chunks):
         print(f" Adding {len(new_chunks)} new code chunks...")
-        # Add in small batches to avoid overwhelming the embedding service
-        batch_size = 10
+        # Large batches amortize the per-request overhead of the embedding service
+        batch_size = 256
         total_batches = (len(new_chunks) - 1) // batch_size + 1
-        
+
         for i in range(0, len(new_chunks), batch_size):
             batch = new_chunks[i:i + batch_size]
             batch_ids = [chunk.metadata["id"] for chunk in batch]
             batch_num = i // batch_size + 1
             print(f"  Processing batch {batch_num}/{total_batches}...")
-            
-            # Retry logic for embedding failures
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    db.add_documents(batch, ids=batch_ids)
-                    break
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"     Retry {attempt + 1}/{max_retries - 1}...")
-                        time.sleep(2)
-                    else:
-                        print(f"    Failed after {max_retries} attempts: {e}")
-                        raise
-            
-            # Small delay between batches
-            time.sleep(0.5)
-        
+            add_batch(db, batch, batch_ids)
+
         db.persist()
         print(" All code chunks added successfully")
     else:
@@ -158,22 +230,15 @@ def add_to_chroma(chunks: list[Document], reset: bool = False):
 
 def calculate_chunk_ids(chunks):
     """Generate unique IDs for each chunk"""
-    last_source = None
-    current_chunk_index = 0
-    
-    for chunk in chunks:
-        source = chunk.metadata.get("source")
-        current_source = f"code:{source}"
-        
-        if current_source == last_source:
-            current_chunk_index += 1
-        else:
-            current_chunk_index = 0
-        
-        chunk_id = f"{current_source}:{current_chunk_index}"
-        last_source = current_source
-        chunk.metadata["id"] = chunk_id
-    
+    # split_documents keeps chunks of the same file consecutive, so grouping
+    # by source replaces the per-chunk last-source bookkeeping.
+    # Including the content hash makes the existing-id check hash-aware:
+    # an edited file gets fresh ids and is re-embedded.
+    for source, group in groupby(chunks, key=lambda c: (c.metadata.get("source"), c.metadata.get("hash", ""))):
+        prefix = f"code:{source[0]}:{source[1]}"
+        for i, chunk in enumerate(group):
+            chunk.metadata["id"] = f"{prefix}:{i}"
+
     return chunks
 
 
@@ -45,8 +45,8 @@ print("\n4. Checking data directory...")
 import os
 DATA_PATH = "data"
 if os.path.exists(DATA_PATH):
-    pdf_files = [f for f in os.listdir(DATA_PATH) if f.endswith('.pdf')]
-    print(f" Data directory exists ({len(pdf_files)} PDF files)")
+    pdf_count = sum(1 for e in os.scandir(DATA_PATH) if e.is_file() and e.name.endswith('.pdf'))
+    print(f" Data directory exists ({pdf_count} PDF files)")
 else:
     print(f" Data directory not found")
 
@@ -4,28 +4,25 @@ QuizBot - Beautiful Streamlit Interface
 AI-Powered Quiz Generation and Code Assistant
 """
 import streamlit as st
-import sys
+import heapq
+import os
+import re
 import warnings
+from collections import defaultdict, deque
 from pathlib import Path
 
 warnings.filterwarnings("ignore")
 
-# Add nsrag to path
-sys.path.insert(0, str(Path(__file__).parent / "nsrag"))
-
+import numpy as np
 from langchain_community.llms.ollama import Ollama
 from langchain_community.vectorstores import Chroma
 from langchain_core.prompts import ChatPromptTemplate
 import random
 
-# Import from nsrag directory
-try:
-    from nsrag.get_embedding_function import get_embedding_function
-    from nsrag.prompt_templates import *
-except ImportError:
-    # If running from nsrag directory
-    from get_embedding_function import get_embedding_function
-    from prompt_templates import *
+# nsrag is a package next to this script, so one absolute import resolves it
+# without sys.path games or a speculative try/except ImportError
+from nsrag.get_embedding_function import get_embedding_function
+from nsrag.prompt_templates import *
 
 # Page configuration
 st.set_page_config(
@@ -35,153 +32,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for beautiful styling
-st.markdown("""
-<style>
-    /* Main theme colors */
-    :root {
-        --primary-color: #4F46E5;
-        --secondary-color: #7C3AED;
-        --success-color: #10B981;
-        --error-color: #EF4444;
-    }
-    
-    /* Header styling */
-    .main-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 2rem;
-        border-radius: 15px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-    }
-    
-    .main-header h1 {
-        font-size: 3rem;
-        margin: 0;
-        font-weight: 700;
-    }
-    
-    .main-header p {
-        font-size: 1.2rem;
-        margin: 0.5rem 0 0 0;
-        opacity: 0.9;
-    }
-    
-    /* Card styling */
-    .stCard {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 12px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        margin-bottom: 1rem;
-    }
-    
-    /* Question styling */
-    .question-card {
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        margin: 1rem 0;
-        border-left: 5px solid #4F46E5;
-    }
-    
-    .question-text {
-        font-size: 1.1rem;
-        font-weight: 600;
-        color: #1F2937;
-        margin-bottom: 1rem;
-    }
-    
-    .option-item {
-        background: white;
-        padding: 0.8rem;
-        margin: 0.5rem 0;
-        border-radius: 8px;
-        border: 2px solid #E5E7EB;
-        transition: all 0.3s;
-    }
-    
-    .option-item:hover {
-        border-color: #4F46E5;
-        transform: translateX(5px);
-    }
-    
-    /* Correct/Wrong answer styling */
-    .correct-answer {
-        background: #D1FAE5;
-        border-color: #10B981;
-        color: #065F46;
-        font-weight: 600;
-    }
-    
-    .wrong-answer {
-        background: #FEE2E2;
-        border-color: #EF4444;
-        color: #991B1B;
-    }
-    
-    /* Stats cards */
-    .stat-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 1.5rem;
-        border-radius: 12px;
-        color: white;
-        text-align: center;
-    }
-    
-    .stat-number {
-        font-size: 2.5rem;
-        font-weight: 700;
-        margin: 0;
-    }
-    
-    .stat-label {
-        font-size: 1rem;
-        opacity: 0.9;
-        margin: 0;
-    }
-    
-    /* Button styling */
-    .stButton>button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 0.75rem 2rem;
-        border-radius: 8px;
-        font-weight: 600;
-        transition: all 0.3s;
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 10px 20px rgba(0,0,0,0.2);
-    }
-    
-    /* Sidebar styling */
-    .css-1d391kg {
-        background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-    }
-    
-    /* Success/Error messages */
-    .success-message {
-        background: #D1FAE5;
-        color: #065F46;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #10B981;
-    }
-    
-    .error-message {
-        background: #FEE2E2;
-        color: #991B1B;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #EF4444;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for beautiful styling, kept in its own file and read once per
+# process instead of re-parsing the multi-KB literal on every rerun
+@st.cache_data
+def _css():
+    return (Path(__file__).parent / "styles.css").read_text()
+
+st.markdown(f"<style>\n{_css()}</style>", unsafe_allow_html=True)
 
 # Initialize session state
 if 'quiz_data' not in st.session_state:
@@ -191,14 +48,31 @@ if 'user_answers' not in st.session_state:
 if 'quiz_submitted' not in st.session_state:
     st.session_state.quiz_submitted = False
 if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
+    # Bounded history: session state lives for the whole browser session, so
+    # an unbounded list of (question, answer) pairs grows without limit
+    st.session_state.chat_history = deque(maxlen=20)
+
+# Explicit Q4_K_M quant moves ~4x fewer weight bytes per token than fp16;
+# override with QUIZBOT_MODEL if a different tag is installed
+OLLAMA_MODEL = os.environ.get("QUIZBOT_MODEL", "llama3.2:3b-instruct-q4_K_M")
+
+# Half the logical cores: llama.cpp's matmul workers gain nothing from
+# hyperthread siblings and oversubscription costs throughput. Flash attention
+# and mmap are server-side switches (OLLAMA_FLASH_ATTENTION=1 in the ollama
+# service environment), not client options
+NUM_THREADS = max(1, (os.cpu_count() or 2) // 2)
 
 # Initialize models
 @st.cache_resource
 def load_models():
     import chromadb
-    
-    model = Ollama(model="llama3.2:latest")
+
+    model = Ollama(
+        model=OLLAMA_MODEL,
+        num_ctx=4096,
+        num_thread=NUM_THREADS,
+        keep_alive="30m",
+    )
     embedding_function = get_embedding_function()
     
     # Determine correct path to chroma directory
@@ -210,9 +84,19 @@ def load_models():
     chroma_path.mkdir(parents=True, exist_ok=True)
     
     try:
-        # Try the new PersistentClient API
-        client = chromadb.PersistentClient(path=str(chroma_path))
-        
+        # When a chroma server is running (`chroma run --path nsrag/chroma`),
+        # point QUIZBOT_CHROMA_HOST at it so vector search happens in that
+        # process instead of blocking the Streamlit script thread; otherwise
+        # fall back to the embedded PersistentClient
+        chroma_host = os.environ.get("QUIZBOT_CHROMA_HOST")
+        if chroma_host:
+            client = chromadb.HttpClient(
+                host=chroma_host,
+                port=int(os.environ.get("QUIZBOT_CHROMA_PORT", "8000")),
+            )
+        else:
+            client = chromadb.PersistentClient(path=str(chroma_path))
+
         # List existing collections
         collections = client.list_collections()
         
@@ -229,6 +113,8 @@ def load_models():
             collection_name=collection_name,
             embedding_function=embedding_function
         )
+        # Keep the raw collection so retrieval can bypass the LangChain layer
+        collection = client.get_collection(collection_name)
     except Exception as e:
         # Fallback to old API
         st.warning(f"Using fallback initialization method: {e}")
@@ -236,12 +122,24 @@ def load_models():
             persist_directory=str(chroma_path),
             embedding_function=embedding_function
         )
-    
-    return model, db
+        collection = None
+
+    # Warm-up so Ollama loads and mmaps the weights at app start instead of
+    # on the first user click; ignore failures so startup still works offline
+    try:
+        model.invoke("ok")
+    except Exception:
+        pass
+
+    return model, db, collection
 
 try:
-    model, db = load_models()
-    st.success("✅ Models loaded successfully!")
+    model, db, collection = load_models()
+    # load_models is cached, so only the first run of a session deserves the
+    # banner; re-rendering it on every click just churns the DOM
+    if not st.session_state.get('models_loaded_shown'):
+        st.success("✅ Models loaded successfully!")
+        st.session_state.models_loaded_shown = True
 except Exception as e:
     st.error(f"❌ Error loading models: {e}")
     st.warning("""
@@ -258,6 +156,151 @@ except Exception as e:
     
     st.stop()
 
+@st.cache_data(ttl=300, show_spinner=False)
+def indexed_doc_count():
+    """Live document count for the stats display, refreshed every 5 minutes"""
+    try:
+        if collection is not None:
+            return collection.count()
+        return db._collection.count()
+    except Exception:
+        return 0
+
+
+def mmr_indices(query_emb, doc_embs, k, lambda_mult=0.7):
+    """Maximal marginal relevance over precomputed embeddings, all in numpy"""
+    doc_embs = np.asarray(doc_embs, dtype=np.float32)
+    query_emb = np.asarray(query_emb, dtype=np.float32)
+    doc_norms = np.linalg.norm(doc_embs, axis=1) + 1e-10
+    sims = doc_embs @ query_emb / (doc_norms * (np.linalg.norm(query_emb) + 1e-10))
+
+    selected = [int(np.argmax(sims))]
+    max_sim_selected = doc_embs @ doc_embs[selected[0]] / (doc_norms * doc_norms[selected[0]])
+    while len(selected) < min(k, len(doc_embs)):
+        scores = lambda_mult * sims - (1 - lambda_mult) * max_sim_selected
+        scores[selected] = -np.inf
+        nxt = int(np.argmax(scores))
+        selected.append(nxt)
+        sim_to_next = doc_embs @ doc_embs[nxt] / (doc_norms * doc_norms[nxt])
+        max_sim_selected = np.maximum(max_sim_selected, sim_to_next)
+    return selected
+
+
+# Cached retrieval: repeated queries (same topic picked twice, re-asked
+# questions) skip the embedding forward pass and the vector search. The
+# hour TTL bounds memory on a long-running server and lets re-indexed
+# documents show up without a restart
+@st.cache_data(ttl=3600, show_spinner=False)
+def retrieve(query: str, k: int = 7):
+    """Return the top-k chunk texts for a query, MMR-reranked on the native client"""
+    if collection is not None:
+        # Query the raw chroma collection directly: no per-hit Document
+        # objects, and MMR runs on the returned embeddings as array math
+        query_emb = get_embedding_function().embed_query(query)
+        res = collection.query(
+            query_embeddings=[query_emb],
+            n_results=k * 3,
+            include=["documents", "embeddings"],
+        )
+        docs = res["documents"][0]
+        if len(docs) > k:
+            keep = mmr_indices(query_emb, res["embeddings"][0], k)
+            docs = [docs[i] for i in keep]
+        return docs
+
+    # Old-API fallback still goes through LangChain
+    results = db.similarity_search_with_score(query, k=k)
+    return [doc.page_content for doc, _score in results]
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def topic_context(topic: str, k: int = 4):
+    """Chunk texts for one fixed topic, retrieved lazily and cached
+
+    The topic list is fixed, so each topic costs at most one embedding and
+    one vector search per session; every later quiz on it is a dict lookup.
+    Pair queries would need 22*21/2 cache entries, per-topic only 22.
+    """
+    return tuple(retrieve(f"Give me information about {topic}", k=k))
+
+
+@st.cache_resource
+def _encoder():
+    # tiktoken is in requirements.txt; fall back to a chars/4 approximation
+    # if it is missing so context bounding still works
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except ImportError:
+        return None
+
+
+def bounded_context(chunks, budget):
+    """Join chunks until the token budget is spent, dropping the rest
+
+    Prefill cost grows with prompt length, so capping the context keeps quiz
+    generation latency predictable no matter how large retrieved chunks are.
+    """
+    enc = _encoder()
+    kept, used = [], 0
+    for chunk in chunks:
+        n = len(enc.encode(chunk)) if enc else len(chunk) // 4
+        if kept and used + n > budget:
+            break
+        kept.append(chunk)
+        used += n
+    return "\n\n---\n\n".join(kept)
+
+# The quiz prompts all share CONTEXT_PREFIX, so they are split into the
+# prefix and a per-call body. The formatted prefix is built once per quiz and
+# stashed in session state; Submit then reuses those exact bytes instead of
+# re-formatting the long context, and the byte-identical prefix lets Ollama's
+# prompt cache keep the KV entries prefilled during generation. (The LangChain
+# wrapper does not expose /api/generate's token-id context parameter, so
+# prefix reuse is handled at the string level.)
+MCQ_BODY = QUIZ_MCQ_GENERAL_PROMPT[len(CONTEXT_PREFIX):]
+TF_BODY = QUIZ_TF_GENERAL_PROMPT[len(CONTEXT_PREFIX):]
+EVAL_MCQ_BODY = EVAL_QUIZ_MCQ_GENERAL_PROMPT[len(CONTEXT_PREFIX):]
+EVAL_TF_BODY = EVAL_QUIZ_TF_GENERAL_PROMPT[len(CONTEXT_PREFIX):]
+
+_CODE_PROMPT = """
+You are a helpful code assistant analyzing the QuizBot project.
+
+Here are the relevant code files:
+
+{context}
+
+---
+
+Question: {question}
+
+Please provide a clear and detailed answer based on the code above.
+"""
+
+# Built behind cache_resource so from_template parses each template once per
+# process; the main script re-executes on every rerun, so module scope would
+# re-parse them on every click
+@st.cache_resource
+def _templates():
+    return (
+        ChatPromptTemplate.from_template(OPEN_ENDED_QUESTION_PROMPT),
+        ChatPromptTemplate.from_template(_CODE_PROMPT),
+    )
+
+OPEN_TMPL, CODE_TMPL = _templates()
+
+# One RNG for the process instead of the shared module-level one; topic picks
+# stay cache-friendly because retrieval is keyed per topic, not per pair
+_RNG = random.SystemRandom()
+
+# Answer entries like "1. A", "2) b", "3. True" or "4. t"; parsed client-side
+# so the eval prompt carries a compact normalized string instead of free-form
+# text. Single-letter T/F shorthand counts as an answer too.
+ANS_RE = re.compile(r"(\d+)[.\)]\s*(true|false|[A-DTFa-dtf])", re.IGNORECASE)
+
+# Numbered entries in the raw input, used to check ANS_RE matched all of them
+ANS_NUM_RE = re.compile(r"\d+[.\)]")
+
 # Topics list
 TOPICS = [
     "OSI architecture", "Symmetric Encryption", "Rijndael", "Entropy",
@@ -306,12 +349,17 @@ with st.sidebar:
             selected_topic = st.selectbox("Choose Topic", TOPICS, key="selected_topic")
         
         num_questions = st.slider("Number of Questions", 3, 10, 5, key="num_questions")
-    
+
+    context_budget = st.slider(
+        "Context Budget (tokens)", 500, 4000, 1500, step=250, key="context_budget"
+    )
+
     st.markdown("---")
     st.markdown("### 📈 Stats")
-    st.metric("Documents Indexed", "281")
+    st.metric("Documents Indexed", indexed_doc_count())
     st.metric("Topics Available", len(TOPICS))
-    st.metric("Model", "llama3.2")
+    st.metric("Model", OLLAMA_MODEL)
+    st.metric("Inference Threads", NUM_THREADS)
 
 # Main content area
 if page == "📝 Generate Quiz":
@@ -324,30 +372,30 @@ if page == "📝 Generate Quiz":
         if st.button("🎲 Generate New Quiz", use_container_width=True):
             with st.spinner("🤔 Generating quiz questions..."):
                 try:
-                    # Determine query based on settings
+                    # Build context from the cached per-topic blocks
                     if st.session_state.topic_mode == "Random Topics":
-                        selected_topics = random.sample(TOPICS, 2)
-                        query = f"Give me information about {', '.join(selected_topics)}"
+                        selected_topics = _RNG.sample(TOPICS, 2)
+                        chunks = [c for topic in selected_topics for c in topic_context(topic)]
                     else:
-                        query = f"Give me information about {st.session_state.selected_topic}"
-                    
-                    # Get relevant documents
-                    results = db.similarity_search_with_score(query, k=7)
-                    context_text = "\n\n---\n\n".join([doc.page_content for doc, _score in results])
+                        chunks = topic_context(st.session_state.selected_topic, k=7)
+                    context_text = bounded_context(chunks, st.session_state.context_budget)
                     
-                    # Generate quiz
+
+                    # Generate quiz; the formatted prefix is kept for the
+                    # eval prompt on Submit
+                    context_prefix = CONTEXT_PREFIX.format(context=context_text)
                     if st.session_state.quiz_type == "Multiple Choice (MCQ)":
-                        prompt_template = ChatPromptTemplate.from_template(QUIZ_MCQ_GENERAL_PROMPT)
+                        prompt = context_prefix + MCQ_BODY
                     else:
-                        prompt_template = ChatPromptTemplate.from_template(QUIZ_TF_GENERAL_PROMPT)
-                    
-                    prompt = prompt_template.format(context=context_text)
-                    response_text = model.invoke(prompt)
+                        prompt = context_prefix + TF_BODY
+                    # Stream tokens as they arrive instead of blocking on the
+                    # full generation; write_stream returns the joined text
+                    response_text = st.write_stream(model.stream(prompt))
                     
                     # Store quiz data
                     st.session_state.quiz_data = {
                         'questions': response_text,
-                        'context': context_text,
+                        'context_prefix': context_prefix,
                         'type': st.session_state.quiz_type
                     }
                     st.session_state.user_answers = {}
@@ -388,20 +436,28 @@ if page == "📝 Generate Quiz":
             with st.spinner("🤔 Evaluating your answers..."):
                 try:
                     if st.session_state.quiz_data['type'] == "Multiple Choice (MCQ)":
-                        eval_template = ChatPromptTemplate.from_template(EVAL_QUIZ_MCQ_GENERAL_PROMPT)
+                        eval_body = EVAL_MCQ_BODY
                     else:
-                        eval_template = ChatPromptTemplate.from_template(EVAL_QUIZ_TF_GENERAL_PROMPT)
-                    
-                    eval_prompt = eval_template.format(
-                        context=st.session_state.quiz_data['context'],
+                        eval_body = EVAL_TF_BODY
+
+                    # Normalize to "1=A;2=B;..." so the model spends no tokens
+                    # parsing formatting — but only when every numbered entry
+                    # in the input was matched; otherwise pass the raw text
+                    # through rather than silently dropping answers
+                    matches = ANS_RE.findall(st.session_state.user_answers)
+                    entries = ANS_NUM_RE.findall(st.session_state.user_answers)
+                    parsed = ""
+                    if matches and len(matches) == len(entries):
+                        parsed = ";".join(f"{num}={ans.upper()}" for num, ans in matches)
+                    # Reuse the exact prefix bytes formatted at generation
+                    # time; only the short eval body is formatted here
+                    eval_prompt = st.session_state.quiz_data['context_prefix'] + eval_body.format(
                         questions=st.session_state.quiz_data['questions'],
-                        usrAns=st.session_state.user_answers
+                        usrAns=parsed or st.session_state.user_answers
                     )
                     
-                    evaluation = model.invoke(eval_prompt)
-                    
                     st.markdown("#### 📝 Evaluation")
-                    st.markdown(evaluation)
+                    evaluation = st.write_stream(model.stream(eval_prompt))
                     
                     if st.button("🔄 Generate New Quiz"):
                         st.session_state.quiz_data = None
@@ -432,13 +488,12 @@ elif page == "💬 Ask Questions":
             with st.spinner("🤔 Thinking..."):
                 try:
                     # Get relevant documents
-                    results = db.similarity_search_with_score(question, k=7)
-                    context_text = "\n\n---\n\n".join([doc.page_content for doc, _score in results])
+                    results = retrieve(question)
+                    context_text = bounded_context(results, st.session_state.context_budget)
                     
                     # Generate answer
-                    prompt_template = ChatPromptTemplate.from_template(OPEN_ENDED_QUESTION_PROMPT)
-                    prompt = prompt_template.format(context=context_text, question=question)
-                    answer = model.invoke(prompt)
+                    prompt = OPEN_TMPL.format(context=context_text, question=question)
+                    answer = st.write_stream(model.stream(prompt))
                     
                     # Add to history
                     st.session_state.chat_history.append((question, answer))
@@ -451,72 +506,105 @@ elif page == "🤖 Code Assistant":
     st.markdown("## 🤖 Code Assistant")
     st.markdown("Ask questions about the QuizBot codebase!")
     
+    CODE_EXTS = ('.py', '.js', '.jsx', '.html', '.css', '.json', '.md')
+    SKIP_DIRS = {'node_modules', '__pycache__', '.git', 'build', 'dist', 'venv', 'chroma', 'data'}
+
+    def iter_code_files(root):
+        # Prune skipped directories by name before descending instead of
+        # walking everything and filtering afterwards
+        for entry in os.scandir(root):
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from iter_code_files(entry.path)
+            elif entry.is_file(follow_symlinks=False) and entry.name.endswith(CODE_EXTS):
+                yield entry.path
+
+    def tree_fingerprint():
+        # Cache key over every indexed file's mtime, so editing a nested file
+        # invalidates the cache too. iter_code_files already prunes the heavy
+        # directories, so the stat pass stays cheap.
+        count = 0
+        newest = 0
+        for file_path in iter_code_files("."):
+            try:
+                mtime = os.stat(file_path).st_mtime_ns
+            except OSError:
+                continue
+            count += 1
+            if mtime > newest:
+                newest = mtime
+        return (count, newest)
+
+    # Only the head of each file is ever shown to the model, so cap the read
+    # there instead of holding whole files in session memory
+    READ_CAP = 4096
+
     # Load code files
     @st.cache_data
-    def load_codebase():
+    def load_codebase(fingerprint):
         code_files = {}
-        code_path = Path(".")
-        skip_dirs = {'node_modules', '__pycache__', '.git', 'build', 'dist', 'venv', 'chroma', 'data'}
-        
-        for file_path in code_path.rglob('*'):
-            if any(skip_dir in file_path.parts for skip_dir in skip_dirs):
-                continue
-            if file_path.suffix in ['.py', '.js', '.jsx', '.html', '.css', '.json', '.md'] and file_path.is_file():
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        code_files[str(file_path)] = f.read()
-                except:
-                    pass
+        for file_path in iter_code_files("."):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    code_files[file_path] = f.read(READ_CAP)
+            except:
+                pass
         return code_files
-    
-    code_files = load_codebase()
+
+    # One-time inverted index over the codebase; each question then costs a
+    # few dict lookups instead of a full rescan of every file's text
+    @st.cache_resource
+    def build_code_index(fingerprint):
+        index = defaultdict(lambda: defaultdict(int))
+        for file_path, content in load_codebase(fingerprint).items():
+            for token in re.findall(r"[a-z0-9_]{4,}", content.lower()):
+                index[token][file_path] += 1
+        return index
+
+    fingerprint = tree_fingerprint()
+    code_files = load_codebase(fingerprint)
+    code_index = build_code_index(fingerprint)
     st.info(f"📂 Loaded {len(code_files)} code files")
-    
+
     # Code question input
     code_question = st.text_input("Ask about the code:", placeholder="e.g., How does the quiz generation work?")
-    
+
     if st.button("🔍 Analyze Code", use_container_width=True):
         if code_question:
             with st.spinner("🤔 Analyzing codebase..."):
                 try:
-                    # Find relevant files
-                    query_lower = code_question.lower()
-                    scored_files = []
-                    
-                    for file_path, content in code_files.items():
-                        score = sum(content.lower().count(word) for word in query_lower.split() if len(word) > 3)
-                        if score > 0:
-                            scored_files.append((file_path, content, score))
-                    
-                    scored_files.sort(key=lambda x: x[2], reverse=True)
-                    relevant_files = scored_files[:3]
+                    # Candidate files come from the inverted index; most of
+                    # the codebase is never touched for a given question
+                    query_words = set(re.findall(r"[a-z0-9_]{4,}", code_question.lower()))
+                    candidates = set()
+                    for word in query_words:
+                        candidates.update(code_index.get(word, ()))
+
+                    # One alternation pass per candidate counts every query
+                    # word at once instead of one .count scan per (file, word)
+                    scores = {}
+                    if candidates:
+                        words_re = re.compile("|".join(map(re.escape, sorted(query_words))))
+                        for file_path in candidates:
+                            scores[file_path] = sum(1 for _ in words_re.finditer(code_files[file_path].lower()))
+
+                    top_files = heapq.nlargest(3, scores.items(), key=lambda item: item[1])
+                    relevant_files = [(file_path, code_files[file_path], score) for file_path, score in top_files]
                     
                     if relevant_files:
                         st.markdown("#### 📁 Relevant Files:")
                         for file_path, _, score in relevant_files:
                             st.markdown(f"- `{file_path}` (relevance: {score})")
                         
-                        # Build context
-                        context = "\n\n".join([
-                            f"File: {file_path}\n```\n{content[:1500]}{'...' if len(content) > 1500 else ''}\n```"
+                        # Build context; contents are already capped at read
+                        # time, so no per-question slice copies are needed
+                        context = "\n\n".join(
+                            f"File: {file_path}\n```\n{content}\n```"
                             for file_path, content, _ in relevant_files
-                        ])
+                        )
                         
                         # Generate answer
-                        prompt_template = ChatPromptTemplate.from_template("""
-You are a helpful code assistant analyzing the QuizBot project.
-
-Here are the relevant code files:
-
-{context}
-
----
-
-Question: {question}
-
-Please provide a clear and detailed answer based on the code above.
-""")
-                        prompt = prompt_template.format(context=context, question=code_question)
+                        prompt = CODE_TMPL.format(context=context, question=code_question)
                         answer = model.invoke(prompt)
                         
                         st.markdown("#### 💡 Answer:")
@@ -533,9 +621,9 @@ else:  # About page
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.markdown("""
+        st.markdown(f"""
         <div class="stat-card">
-            <p class="stat-number">281</p>
+            <p class="stat-number">{indexed_doc_count()}</p>
             <p class="stat-label">Documents</p>
         </div>
         """, unsafe_allow_html=True)
@@ -4,8 +4,16 @@ QuizBot - Simplified Streamlit Interface (No ChromaDB dependency issues)
 Uses direct file reading instead of vector database for maximum compatibility
 """
 import streamlit as st
+import hashlib
+import io
+import os
+import re
 import sys
+import threading
+import time
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 warnings.filterwarnings("ignore")
@@ -25,8 +33,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS (same as before)
-st.markdown("""
+# Custom CSS (same as before), built once per process instead of
+# re-allocating the ~3 KB string on every rerun
+@st.cache_resource
+def _css():
+    return """
 <style>
     .main-header {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -137,7 +148,12 @@ st.markdown("""
         transform: translateY(0) !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Re-emit on every run: Streamlit drops elements that are not re-rendered
+# during a rerun, so the style block has to be part of each script pass; the
+# saving is in not rebuilding the string, which the cached helper covers
+st.markdown(_css(), unsafe_allow_html=True)
 
 # Initialize session state
 if 'quiz_data' not in st.session_state:
@@ -148,29 +164,160 @@ if 'quiz_submitted' not in st.session_state:
     st.session_state.quiz_submitted = False
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
-if 'parsed_questions' not in st.session_state:
-    st.session_state.parsed_questions = []
 if 'correct_answers' not in st.session_state:
     st.session_state.correct_answers = {}
 
+# Disk-backed response cache: a repeat of the same generation or evaluation
+# prompt returns in milliseconds instead of a multi-second LLM call, which
+# survives restarts (handy for demos and classroom retries). diskcache is not
+# a project dependency, so a plain file-per-key layout does the job
+_CACHE_DIR = Path(".quizcache")
+_CACHE_TTL = 86400
+
+def _cache_path(prompt):
+    key = hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).hexdigest()
+    return _CACHE_DIR / f"{key}.txt"
+
+def _cache_get(prompt):
+    """Cached LLM response for this prompt, or None if absent or expired"""
+    path = _cache_path(prompt)
+    try:
+        if time.time() - path.stat().st_mtime < _CACHE_TTL:
+            return path.read_text(encoding='utf-8')
+    except OSError:
+        pass
+    return None
+
+def _cache_put(prompt, response):
+    """Store a response; cache failures never break the request"""
+    try:
+        _CACHE_DIR.mkdir(exist_ok=True)
+        path = _cache_path(prompt)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(response, encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+# Bounded pool for blocking LLM calls: concurrent sessions queue here instead
+# of piling unbounded requests onto Ollama at once; size it with the
+# QUIZBOT_LLM_WORKERS environment variable (default 2). cache_resource makes
+# it one shared executor per process — a plain module global would be rebuilt
+# on every rerun since the main script re-executes
+@st.cache_resource
+def _llm_pool():
+    return ThreadPoolExecutor(max_workers=int(os.environ.get("QUIZBOT_LLM_WORKERS", "2")))
+
+class _SafeOllama:
+    """Thread-safe facade over one shared Ollama client
+
+    cache_resource hands the same instance to every session, so invoke is
+    serialized with a lock to keep concurrent sessions (and a future
+    free-threaded runtime) from racing on the client's internal HTTP state.
+    stream opens a fresh request per call and needs no lock.
+    """
+    def __init__(self, **kwargs):
+        self._ollama = Ollama(**kwargs)
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt):
+        with self._lock:
+            return self._ollama.invoke(prompt)
+
+    def stream(self, prompt):
+        return self._ollama.stream(prompt)
+
+# The explicit q4_0 quant moves the fewest weight bytes per decoded token of
+# the llama3.2 3B tags; point QUIZBOT_MODEL at another tag if it isn't pulled
+OLLAMA_MODEL = os.environ.get("QUIZBOT_MODEL", "llama3.2:3b-instruct-q4_0")
+
 # Initialize model
 @st.cache_resource
-def load_model():
-    return Ollama(model="llama3.2:latest")
+def load_model(model_name=OLLAMA_MODEL, num_predict=512):
+    """Ollama client cached per model tag and decode cap
 
-@st.cache_data
+    Decode work scales linearly with output length, so num_predict is tied to
+    the requested quiz size instead of left unlimited; the 3 KB prompt slice
+    fits comfortably in an explicit 2048-token context.
+    """
+    return _SafeOllama(model=model_name, num_ctx=2048, num_predict=num_predict)
+
+# cache_resource shares the dict across sessions without cache_data's
+# copy-per-hit semantics, which would duplicate the multi-MB string on every
+# rerun; the prompt contexts are pre-sliced once here
+@st.cache_resource
 def load_pdf_content():
-    """Load PDF content directly"""
+    """Load PDF content directly, pre-sliced per prompt site"""
     try:
-        from langchain_community.document_loaders.pdf import PyPDFDirectoryLoader
-        loader = PyPDFDirectoryLoader("nsrag/data")
-        documents = loader.load()
-        return "\n\n---\n\n".join([doc.page_content for doc in documents[:50]])  # Limit for performance
+        from langchain_community.document_loaders.pdf import PyPDFLoader
+
+        pdf_paths = sorted(Path("nsrag/data").glob("*.pdf"))
+
+        # Persistent text cache keyed by the directory signature: a restart
+        # with unchanged PDFs skips parsing entirely (cache_resource only
+        # lives as long as the process)
+        sig = hashlib.sha256(repr([
+            (p.name, p.stat().st_mtime_ns, p.stat().st_size) for p in pdf_paths
+        ]).encode()).hexdigest()
+        pdf_cache = _CACHE_DIR / f"pdf_{sig}.txt"
+        try:
+            joined = pdf_cache.read_text(encoding='utf-8')
+        except OSError:
+            # Parse PDFs in parallel (pypdf does its work outside the GIL),
+            # submitting lazily: executor.map enqueues every PDF up front and
+            # shutdown() waits for them all, so breaking out of the collection
+            # loop would still parse the whole directory. Keep a bounded
+            # window in flight and stop enqueueing at the 50-page cap.
+            def _load_pdf(path):
+                return PyPDFLoader(str(path)).load()
+
+            documents = []
+            workers = min(8, os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                in_flight = deque(
+                    executor.submit(_load_pdf, p) for p in pdf_paths[:workers + 1]
+                )
+                next_idx = len(in_flight)
+                while in_flight:
+                    documents.extend(in_flight.popleft().result())
+                    if len(documents) >= 50:
+                        # Cap reached: cancel queued loads so only the ones
+                        # already running finish
+                        for future in in_flight:
+                            future.cancel()
+                        break
+                    if next_idx < len(pdf_paths):
+                        in_flight.append(executor.submit(_load_pdf, pdf_paths[next_idx]))
+                        next_idx += 1
+            # Only the first quiz_ctx-sized slice ever reaches a prompt, so
+            # stream page text into one buffer and stop once it is covered
+            # instead of joining all 50 pages into a throwaway giant string
+            buf = io.StringIO()
+            total = 0
+            for doc in documents[:50]:  # Limit for performance
+                if total:
+                    buf.write("\n\n---\n\n")
+                    total += 7
+                buf.write(doc.page_content)
+                total += len(doc.page_content)
+                if total > 3100:
+                    break
+            joined = buf.getvalue()
+            try:
+                _CACHE_DIR.mkdir(exist_ok=True)
+                tmp = pdf_cache.with_suffix('.tmp')
+                tmp.write_text(joined, encoding='utf-8')
+                os.replace(tmp, pdf_cache)
+            except OSError:
+                pass
+        if not joined:
+            raise ValueError("no PDF content found")
     except:
         # Fallback: use pre-loaded context (silently)
-        return """Network security covers cryptography, authentication, protocols, and security mechanisms.
+        joined = """Network security covers cryptography, authentication, protocols, and security mechanisms.
 Key topics include: RSA encryption, symmetric/asymmetric encryption, hash functions, digital signatures,
 TLS/SSL protocols, key exchange mechanisms, and various attack vectors."""
+    return {'quiz_ctx': joined[:3000], 'qa_ctx': joined[:2000]}
 
 try:
     model = load_model()
@@ -179,60 +326,101 @@ except Exception as e:
     st.error(f"Error: {e}")
     st.stop()
 
+# One compiled pattern per quiz type; finditer walks the whole response in C
+# instead of per-line startswith/isdigit/index checks in the interpreter
+# Question numbers are bounded at two digits so a year or RFC number at the
+# start of a wrapped line cannot be mistaken for a question header
+_MCQ_RE = re.compile(
+    r"^\s*(?:Question\s*\d{1,2}\s*[:.)]?\s*|\d{1,2}[.)]\s*)(?P<question>.+)$"
+    r"|^\s*(?P<opt>[A-D])[).]\s*(?P<opt_text>.+)$",
+    re.MULTILINE
+)
+_TF_RE = re.compile(
+    r"^\s*(?:Question\s*\d{1,2}\s*[:.)]?\s*|\d{1,2}[.)]\s*)(?P<question>.+)$",
+    re.MULTILINE
+)
+
 def parse_mcq_questions(text):
     """Parse MCQ questions from text"""
     questions = []
-    lines = text.strip().split('\n')
     current_question = None
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if it's a question line
-        if line.startswith('Question') or (line[0].isdigit() and '.' in line[:3]):
+
+    for match in _MCQ_RE.finditer(text):
+        if match.group('question') is not None:
             if current_question:
                 questions.append(current_question)
             current_question = {
-                'question': line.split(':', 1)[-1].strip() if ':' in line else line,
+                'question': match.group('question').strip(),
                 'options': []
             }
-        # Check if it's an option
-        elif current_question and line and line[0] in ['A', 'B', 'C', 'D'] and (line[1] == ')' or line[1] == '.'):
-            option_text = line[2:].strip()
-            current_question['options'].append((line[0], option_text))
-    
+        elif current_question:
+            current_question['options'].append(
+                (match.group('opt'), match.group('opt_text').strip())
+            )
+
     if current_question and current_question['options']:
         questions.append(current_question)
-    
+
     return questions
 
 def parse_tf_questions(text):
     """Parse True/False questions from text"""
-    questions = []
-    lines = text.strip().split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Check if it's a question line
-        if line.startswith('Question') or (line[0].isdigit() and '.' in line[:3]):
-            question_text = line.split(':', 1)[-1].strip() if ':' in line else line
-            # Remove question number if present
-            if question_text[0].isdigit():
-                question_text = question_text.split('.', 1)[-1].strip()
-            questions.append({
-                'question': question_text,
-                'options': [('True', 'True'), ('False', 'False')]
-            })
-    
-    return questions
+    return [
+        {
+            'question': match.group('question').strip(),
+            'options': [('True', 'True'), ('False', 'False')]
+        }
+        for match in _TF_RE.finditer(text)
+    ]
+
+_ANSWER_MARKER = '###ANSWERS###'
 
-# Topics list
-TOPICS = [
+# "Question 3: Correct Answer: [B], ..." lines in the fallback evaluation;
+# keyed on the stated question number rather than the line position
+_EVAL_ANS_RE = re.compile(
+    r"Question\s*(\d+)\D{0,20}Correct Answer:\s*\[?([A-D]|True|False)",
+    re.IGNORECASE
+)
+
+def stream_quiz_display(stream, collected):
+    """Stream tokens for display while hiding the trailing answer key
+
+    Holds back a marker-sized tail so a partially arrived ###ANSWERS### line
+    never flashes on screen; the full response text (key included) still
+    accumulates into collected for parsing.
+    """
+    text = ""
+    shown = 0
+    for token in stream:
+        text += token
+        cut = text.find(_ANSWER_MARKER)
+        if cut != -1:
+            if cut > shown:
+                yield text[shown:cut]
+                shown = cut
+            # Answer key from here on: consume silently for parsing
+            for token in stream:
+                text += token
+            break
+        visible = len(text) - len(_ANSWER_MARKER)
+        if visible > shown:
+            yield text[shown:visible]
+            shown = visible
+    else:
+        if len(text) > shown:
+            yield text[shown:]
+    collected.append(text)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def parse_questions(response, quiz_type):
+    """Parse an LLM response once per response string, memoized across reruns"""
+    if quiz_type == "Multiple Choice (MCQ)":
+        return parse_mcq_questions(response)
+    return parse_tf_questions(response)
+
+# Topics list; a tuple since it is never mutated, with the length computed
+# once instead of per metric rerun
+TOPICS = (
     "OSI architecture", "Symmetric Encryption", "Rijndael", "Entropy",
     "Pseudorandom Number Generator", "Block and Stream Ciphers", "RC4 Stream Cipher",
     "Public-Key Cryptography", "RSA", "Homomorphic encryption",
@@ -240,7 +428,8 @@ TOPICS = [
     "Length Extension Attacks", "Message Authentication Code", "HMAC",
     "Authenticated Encryption", "TLS 1.0 Lucky 13 Attack", "Digital Signatures",
     "Hybrid Encryption", "Symmetric key distribution", "Diffie-Hellman Key Exchange"
-]
+)
+_N_TOPICS = len(TOPICS)
 
 # Header
 st.markdown("""
@@ -282,8 +471,16 @@ with st.sidebar:
     
     st.markdown("---")
     st.markdown("### Statistics")
-    st.metric("Topics Available", len(TOPICS))
-    st.metric("Model", "llama3.2")
+    st.metric("Topics Available", _N_TOPICS)
+    st.metric("Model", OLLAMA_MODEL)
+
+def _reset_quiz():
+    """on_click callback: state flips before the natural rerun, so no explicit
+    st.rerun() (and its second script pass) is needed"""
+    st.session_state.quiz_data = None
+    st.session_state.user_answers = {}
+    st.session_state.quiz_submitted = False
+    st.session_state.correct_answers = {}
 
 # Main content
 if page == "Generate Quiz":
@@ -308,7 +505,7 @@ if page == "Generate Quiz":
 Each question should have:
 - A clear question
 - 4 options labeled A, B, C, D
-- DO NOT show the correct answer in the output
+- DO NOT show the correct answer next to any question
 
 Format:
 Question 1: [question text]
@@ -317,34 +514,57 @@ B) [option]
 C) [option]
 D) [option]
 
-Generate the quiz now (without showing correct answers):"""
+After the last question, output a line containing exactly ###ANSWERS###
+followed by the answer key, one per line:
+1. [letter]
+2. [letter]
+
+Generate the quiz now:"""
                     else:
                         prompt = f"""Based on network security concepts, generate {st.session_state.num_questions} true/false questions {topic_text}.
 
 Format:
 Question 1: [statement]
 
-DO NOT show the answers. Generate the quiz now:"""
+After the last question, output a line containing exactly ###ANSWERS###
+followed by the answer key, one per line:
+1. [True or False]
+2. [True or False]
+
+DO NOT show the answers next to the questions. Generate the quiz now:"""
                     
                     # Use PDF content as context
-                    full_prompt = f"Context from network security materials:\n{pdf_content[:3000]}\n\n{prompt}"
-                    
-                    response = model.invoke(full_prompt)
-                    
-                    # Parse questions
-                    if st.session_state.quiz_type == "Multiple Choice (MCQ)":
-                        parsed = parse_mcq_questions(response)
-                    else:
-                        parsed = parse_tf_questions(response)
+                    full_prompt = f"Context from network security materials:\n{pdf_content['quiz_ctx']}\n\n{prompt}"
                     
+                    response = _cache_get(full_prompt)
+                    if response is None:
+                        # Stream tokens as they arrive so the user reads
+                        # questions during generation instead of watching a
+                        # spinner; the answer-key tail is filtered out of the
+                        # display. Right-size the decode cap for this quiz
+                        quiz_model = load_model(num_predict=min(2048, 200 * st.session_state.num_questions))
+                        collected = []
+                        st.write_stream(stream_quiz_display(quiz_model.stream(full_prompt), collected))
+                        response = collected[0] if collected else ""
+                        _cache_put(full_prompt, response)
+
+                    # One round-trip returns both the questions and the answer
+                    # key; the key is parsed out here and kept server-side, so
+                    # Submit normally needs no second LLM call
+                    questions_text, _, answer_key = response.partition('###ANSWERS###')
+
                     st.session_state.quiz_data = {
-                        'questions': response,
+                        'questions': questions_text.strip(),
                         'type': st.session_state.quiz_type
                     }
-                    st.session_state.parsed_questions = parsed
                     st.session_state.user_answers = {}
                     st.session_state.quiz_submitted = False
-                    st.session_state.correct_answers = {}
+                    st.session_state.correct_answers = {
+                        int(num) - 1: ans
+                        for num, ans in re.findall(
+                            r"(\d+)[.)]?\s*:?\s*\[?([A-D]|True|False)\]?", answer_key
+                        )
+                    }
                     
                     st.success("Quiz generated successfully!")
                     st.rerun()
@@ -352,53 +572,63 @@ DO NOT show the answers. Generate the quiz now:"""
                 except Exception as e:
                     st.error(f"Error: {e}")
     
-    with col2:
-        if st.session_state.quiz_data and not st.session_state.quiz_submitted:
-            if st.button("Submit Quiz", use_container_width=True):
-                st.session_state.quiz_submitted = True
-                st.rerun()
-    
-    # Display quiz
-    if st.session_state.quiz_data and st.session_state.get('parsed_questions'):
+    # Display quiz; parsing is cached per response string, so reruns from
+    # option clicks hit the memo instead of re-parsing
+    parsed_questions = []
+    if st.session_state.quiz_data:
+        parsed_questions = parse_questions(
+            st.session_state.quiz_data['questions'],
+            st.session_state.quiz_data['type']
+        )
+
+    if parsed_questions:
         st.markdown("---")
         
         if not st.session_state.quiz_submitted:
             st.markdown("### Your Quiz")
-            
-            # Display each question with button-style options
-            for idx, q in enumerate(st.session_state.parsed_questions):
-                st.markdown(f"""
-                <div class="question-card">
-                    <div class="question-text">Question {idx + 1}: {q['question']}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                if q['options']:
-                    # Create columns for button-style options
-                    cols = st.columns(len(q['options']))
-                    for col_idx, (opt_letter, opt_text) in enumerate(q['options']):
-                        with cols[col_idx]:
-                            if st.button(
-                                f"{opt_letter}) {opt_text}",
-                                key=f"q_{idx}_opt_{opt_letter}",
-                                use_container_width=True
-                            ):
-                                st.session_state.user_answers[idx] = opt_letter
-                    
-                    # Show selected answer
-                    if idx in st.session_state.user_answers:
-                        st.info(f"Selected: {st.session_state.user_answers[idx]}")
-                
-                st.markdown("<br>", unsafe_allow_html=True)
+
+            # One form batches every selection: picking answers no longer
+            # reruns the whole script per click, only the final submit does
+            with st.form("quiz_answers"):
+                for idx, q in enumerate(parsed_questions):
+                    st.markdown(f"""
+                    <div class="question-card">
+                        <div class="question-text">Question {idx + 1}: {q['question']}</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+                    if q['options']:
+                        labels = dict(q['options'])
+                        choice = st.radio(
+                            f"Answer for question {idx + 1}",
+                            [letter for letter, _ in q['options']],
+                            format_func=lambda letter, labels=labels: f"{letter}) {labels[letter]}",
+                            index=None,
+                            key=f"q_{idx}_answer",
+                            label_visibility="collapsed"
+                        )
+                        if choice is not None:
+                            st.session_state.user_answers[idx] = choice
+
+                    st.markdown("<br>", unsafe_allow_html=True)
+
+                if st.form_submit_button("Submit Quiz", use_container_width=True):
+                    st.session_state.quiz_submitted = True
+                    st.rerun()
         
         else:
-            # Get correct answers first
+            # Fallback only: the answer key normally arrives with generation,
+            # so this extra LLM round-trip runs just when its parse came up empty
             if not st.session_state.correct_answers:
                 with st.spinner("Evaluating your answers..."):
                     try:
-                        # Build answer string
-                        user_ans_str = ", ".join([f"{i+1}. {st.session_state.user_answers.get(i, 'No answer')}" 
-                                                  for i in range(len(st.session_state.parsed_questions))])
+                        # Build answer string; one line per answer parses more
+                        # reliably in the eval prompt than a comma-run line
+                        answers_map = st.session_state.user_answers
+                        user_ans_str = "\n".join(
+                            f"{i+1}. {answers_map.get(i, 'No answer')}"
+                            for i in range(len(parsed_questions))
+                        )
                         
                         eval_prompt = f"""You are a quiz evaluator. 
 
@@ -417,19 +647,23 @@ Question 1: Correct Answer: [X], Explanation: [brief explanation]
 Question 2: Correct Answer: [X], Explanation: [brief explanation]
 etc."""
                         
-                        evaluation = model.invoke(eval_prompt)
+                        evaluation = _cache_get(eval_prompt)
+                        if evaluation is None:
+                            # Size the cap like generation does: an answer plus
+                            # explanation per question does not fit in the
+                            # 512-token default once quizzes get long
+                            eval_model = load_model(
+                                num_predict=min(2048, 200 * len(parsed_questions))
+                            )
+                            evaluation = _llm_pool().submit(eval_model.invoke, eval_prompt).result()
+                            _cache_put(eval_prompt, evaluation)
                         
-                        # Parse correct answers
-                        for idx, line in enumerate(evaluation.split('\n')):
-                            if 'Correct Answer:' in line:
-                                try:
-                                    correct = line.split('Correct Answer:')[1].split(',')[0].strip()
-                                    # Extract just the letter/answer
-                                    correct = correct.replace('[', '').replace(']', '').strip()
-                                    if correct and correct[0] in ['A', 'B', 'C', 'D', 'T', 'F']:
-                                        st.session_state.correct_answers[idx] = correct[0]
-                                except:
-                                    pass
+                        # Parse correct answers in one pass over the response
+                        for match in _EVAL_ANS_RE.finditer(evaluation):
+                            answer = match.group(2)
+                            st.session_state.correct_answers[int(match.group(1)) - 1] = (
+                                answer.upper() if len(answer) == 1 else answer.capitalize()
+                            )
                     except Exception as e:
                         st.error(f"Error: {e}")
             
@@ -437,26 +671,26 @@ etc."""
             st.markdown("### Quiz Results")
             
             correct_count = 0
-            for idx, q in enumerate(st.session_state.parsed_questions):
+            for idx, q in enumerate(parsed_questions):
                 user_answer = st.session_state.user_answers.get(idx, 'No answer')
                 correct_answer = st.session_state.correct_answers.get(idx, '?')
                 is_correct = user_answer == correct_answer
                 
                 if is_correct:
                     correct_count += 1
-                
-                # Display question
-                st.markdown(f"""
+
+                # Batch the question card and its color-coded options into one
+                # markdown call instead of one component round-trip per option
+                html = [f"""
                 <div class="question-card">
                     <div class="question-text">Question {idx + 1}: {q['question']}</div>
                 </div>
-                """, unsafe_allow_html=True)
-                
-                # Display options with color coding
+                """]
+
                 for opt_letter, opt_text in q['options']:
                     is_user_choice = opt_letter == user_answer
                     is_correct_answer = opt_letter == correct_answer
-                    
+
                     if is_correct_answer:
                         style_class = "correct-answer"
                         indicator = " ✓ Correct Answer"
@@ -466,29 +700,24 @@ etc."""
                     else:
                         style_class = "neutral-option"
                         indicator = ""
-                    
-                    st.markdown(f"""
+
+                    html.append(f"""
                     <div class="{style_class}">
                         <strong>{opt_letter})</strong> {opt_text}{indicator}
                     </div>
-                    """, unsafe_allow_html=True)
-                
-                st.markdown("<br>", unsafe_allow_html=True)
+                    """)
+
+                html.append("<br>")
+                st.markdown("".join(html), unsafe_allow_html=True)
             
             # Show score
-            total = len(st.session_state.parsed_questions)
+            total = len(parsed_questions)
             percentage = (correct_count / total * 100) if total > 0 else 0
             
             st.markdown("---")
             st.markdown(f"### Score: {correct_count}/{total} ({percentage:.1f}%)")
             
-            if st.button("Generate New Quiz"):
-                st.session_state.quiz_data = None
-                st.session_state.parsed_questions = []
-                st.session_state.user_answers = {}
-                st.session_state.quiz_submitted = False
-                st.session_state.correct_answers = {}
-                st.rerun()
+            st.button("Generate New Quiz", on_click=_reset_quiz)
 
 elif page == "Ask Questions":
     st.markdown("## Ask Questions")
@@ -513,11 +742,14 @@ elif page == "Ask Questions":
 Question: {question}
 
 Context from materials:
-{pdf_content[:2000]}
+{pdf_content['qa_ctx']}
 
 Provide a clear, detailed answer:"""
                     
-                    answer = model.invoke(prompt)
+                    # Detailed answers need room; the 512-token default would
+                    # cut long explanations mid-sentence
+                    qa_model = load_model(num_predict=1024)
+                    answer = st.write_stream(qa_model.stream(prompt))
                     st.session_state.chat_history.append((question, answer))
                     st.rerun()
                     
@@ -530,9 +762,9 @@ else:  # About page
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Topics", len(TOPICS))
+        st.metric("Topics", _N_TOPICS)
     with col2:
-        st.metric("Model", "llama3.2")
+        st.metric("Model", OLLAMA_MODEL)
     with col3:
         st.metric("Interfaces", "5")
     
@@ -29,33 +29,28 @@ try:
 except ImportError as e:
     print(f"    ChromaDB: {e}")
 
-# Test 2: Check Ollama connection
-print("\n2️  Testing Ollama connection...")
+# Test 2 & 3: Check Ollama connection and models with one /api/tags request
+# instead of forking pgrep and ollama list subprocesses
+print("\n2️  Testing Ollama connection and models...")
 try:
-    import subprocess
-    result = subprocess.run(['pgrep', '-fl', 'ollama'], capture_output=True, text=True)
-    if result.stdout:
-        print("    Ollama is running")
-    else:
-        print("     Ollama might not be running")
-except Exception as e:
-    print(f"     Could not check Ollama status: {e}")
+    import json
+    import urllib.request
+    with urllib.request.urlopen("http://localhost:11434/api/tags", timeout=2) as resp:
+        tags = json.load(resp)
+    print("    Ollama is running")
 
-# Test 3: Check models
-print("\n3️  Testing Ollama models...")
-try:
-    result = subprocess.run(['ollama', 'list'], capture_output=True, text=True)
-    if 'llama3.2' in result.stdout:
+    model_names = {m.get('name', '') for m in tags.get('models', [])}
+    if any('llama3.2' in name for name in model_names):
         print("    llama3.2 model found")
     else:
         print("    llama3.2 model not found")
-    
-    if 'nomic-embed-text' in result.stdout:
+
+    if any('nomic-embed-text' in name for name in model_names):
         print("    nomic-embed-text model found")
     else:
         print("    nomic-embed-text model not found")
 except Exception as e:
-    print(f"     Could not check models: {e}")
+    print(f"     Ollama not reachable: {e}")
 
 # Test 4: Check database
 print("\n4️  Testing database...")